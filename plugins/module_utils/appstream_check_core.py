@@ -1,18 +1,38 @@
 """Core AppStream lifecycle check logic shared by Ansible module and standalone CLI."""
 
+import os
+import re
+
 from datetime import date as _date
-from typing import Any, Callable, Dict, List, Tuple, Union
+from functools import lru_cache
+from typing import Any, Callable, Collection, Dict, List, Tuple, Union
 from pathlib import Path
 
+# Well-formed `rpm -qa --qf "%{NAME} %{MODULARITYLABEL}\n"` line: package name,
+# then either `(none)` or a modularity label whose first two `:`-separated
+# fields become the module key.
+_RPM_LINE_RE = re.compile(r"(?m)^[ \t]*(\S+) +(?:\(none\)|([^:\s]+):([^:\s]+)(?::\S+)?)[ \t]*$")
+_NONBLANK_LINE_RE = re.compile(r"(?m)^[ \t]*\S")
 
-def parse_date(value: Union[str, _date]) -> _date:
-    """Parse a date string in YYYY-MM-DD format or return an existing date object.
+# VERSION_ID line in os-release; quoting and whitespace are stripped afterwards.
+# Bytes pattern: the file is matched without an up-front UTF-8 decode.
+_VERSION_ID_RE = re.compile(rb"(?m)^[ \t]*VERSION_ID=(.*)$")
 
-    Raises ValueError for invalid or unparseable date values.
+
+@lru_cache(maxsize=4096)
+def _parse_iso_cached(text: str) -> _date:
+    """Parse a date string in YYYY-MM-DD format, memoizing each distinct string.
+
+    Reference data repeats the same end_date strings across many entries (same
+    EOL cohort), so caching reduces parse work to one per distinct date.
     """
-    if isinstance(value, _date):
-        return value
-    text = str(value).strip()
+    # Fast path for strict zero-padded YYYY-MM-DD: construct the date from
+    # positional slices without the fromisoformat call or exception setup.
+    if len(text) == 10 and text[4] == "-" == text[7]:
+        try:
+            return _date(int(text[0:4]), int(text[5:7]), int(text[8:10]))
+        except ValueError:
+            pass
     fromisoformat = getattr(_date, "fromisoformat", None)
     if fromisoformat is not None:
         try:
@@ -26,25 +46,54 @@ def parse_date(value: Union[str, _date]) -> _date:
             return _date(int(parts[0]), int(parts[1]), int(parts[2]))
     except (ValueError, IndexError, TypeError):
         pass
-    raise ValueError(f"Invalid date format {value!r}, expected YYYY-MM-DD")
+    raise ValueError(f"Invalid date format {text!r}, expected YYYY-MM-DD")
+
+
+def parse_date(value: Union[str, _date]) -> _date:
+    """Parse a date string in YYYY-MM-DD format or return an existing date object.
+
+    Raises ValueError for invalid or unparseable date values.
+    """
+    if isinstance(value, _date):
+        return value
+    if type(value) is str:  # exact type check, no MRO walk  # pylint: disable=unidiomatic-typecheck
+        return _parse_iso_cached(value.strip())
+    return _parse_iso_cached(str(value).strip())
+
+
+@lru_cache(maxsize=8)
+def _read_version_id(os_release_path: str) -> str:
+    """Read the VERSION_ID value from an os-release file, or "" when absent.
+
+    Cached per path: os-release content is invariant for the life of a
+    process, so repeated detection calls become a dict lookup.
+    """
+    try:
+        data = Path(os_release_path).read_bytes()
+    except OSError:
+        return ""
+
+    # The file is ~1 KB; one regex pass over the raw bytes beats a
+    # Python-level line loop and skips decoding the whole buffer.
+    match = _VERSION_ID_RE.search(data)
+    if not match:
+        return ""
+    return match.group(1).strip().strip(b'"').strip(b"'").decode("utf-8", errors="replace")
+
+
+def clear_os_release_cache() -> None:
+    """Clear the memoized os-release data (mainly for tests)."""
+    _read_version_id.cache_clear()
 
 
 def detect_target_major(os_release_path: str = "/etc/os-release") -> str:
     """Detect and return the target major key (for example `el9`) from os-release."""
 
     version_id = None
-    path = Path(os_release_path)
-
-    if path.exists():
-        try:
-            with path.open("r", encoding="utf-8") as file_handle:
-                for line in file_handle:
-                    line = line.strip()
-                    if line.startswith("VERSION_ID="):
-                        version_id = line.split("=", 1)[1].strip().strip('"').strip("'")
-                        break
-        except OSError:
-            pass
+    # Stat before consulting the cache so a missing file is never cached as a
+    # negative result; a file that appears later is then still picked up.
+    if Path(os_release_path).exists():
+        version_id = _read_version_id(os_release_path)
 
     if not version_id:
         raise ValueError("Unable to detect VERSION_ID from /etc/os-release; pass target_major explicitly.")
@@ -61,8 +110,29 @@ def detect_target_major(os_release_path: str = "/etc/os-release") -> str:
 def parse_rpm_modularity_output(output: str) -> Tuple[Dict[str, List[str]], List[str]]:
     """Parse `rpm -qa` modularity output into module map and non-modular package list."""
 
+    matches = _RPM_LINE_RE.findall(output)
+    if len(matches) != len(_NONBLANK_LINE_RE.findall(output)):
+        # Some non-blank line did not match the fast pattern; re-parse line by
+        # line to either accept the odd formatting or raise a precise error.
+        return _parse_rpm_lines(output)
+
+    modules_raw: dict[str, list[str]] = {}
+    installed_packages: set[str] = set()
+
+    for package_name, module_name, stream in matches:
+        if not module_name:
+            installed_packages.add(package_name)
+        else:
+            modules_raw.setdefault(f"{module_name}:{stream}", []).append(package_name)
+
+    return modules_raw, sorted(installed_packages)
+
+
+def _parse_rpm_lines(output: str) -> Tuple[Dict[str, List[str]], List[str]]:
+    """Line-by-line rpm output parser used when the single-pass pattern does not match."""
+
     modules_raw: dict[str, list[str]] = {}
-    installed_packages: list[str] = []
+    installed_packages: set[str] = set()
 
     for line in output.splitlines():
         line = line.strip()
@@ -76,7 +146,7 @@ def parse_rpm_modularity_output(output: str) -> Tuple[Dict[str, List[str]], List
         package_name, label = parts[0].strip(), parts[1].strip()
 
         if label == "(none)":
-            installed_packages.append(package_name)
+            installed_packages.add(package_name)
             continue
 
         label_parts = label.split(":")
@@ -86,26 +156,214 @@ def parse_rpm_modularity_output(output: str) -> Tuple[Dict[str, List[str]], List
         key = f"{label_parts[0]}:{label_parts[1]}"
         modules_raw.setdefault(key, []).append(package_name)
 
-    return modules_raw, sorted(set(installed_packages))
+    return modules_raw, sorted(installed_packages)
 
 
 def collect_installed_from_rpm(
     run_command: Callable[[List[str]], Tuple[int, str, str]],
+    include_modules: bool = True,
 ) -> Tuple[Dict[str, List[str]], List[str]]:
-    """Collect installed package/module data by invoking `rpm -qa` via provided runner."""
+    """Collect installed package/module data by invoking `rpm -qa` via provided runner.
 
-    _return_code, output, _error = run_command(["rpm", "-qa", "--qf", "%{NAME} %{MODULARITYLABEL}\\n"])
+    Performs exactly one rpm invocation regardless of package count; callers
+    must never loop this per package, since the subprocess fork/exec is the
+    expensive part. With include_modules=False (for example on EL7, which
+    has no modularity) only package names are queried and the modularity
+    parsing is skipped.
+    """
+
+    # --nosignature/--nodigest skip per-package verification for this local query.
+    if not include_modules:
+        _return_code, output, _error = run_command(["rpm", "-qa", "--nosignature", "--nodigest", "--qf", "%{NAME}\\n"])
+        return {}, sorted(set(output.split()))
+
+    _return_code, output, _error = run_command(
+        ["rpm", "-qa", "--nosignature", "--nodigest", "--qf", "%{NAME} %{MODULARITYLABEL}\\n"]
+    )
     return parse_rpm_modularity_output(output)
 
 
-def _is_retired(end_date_raw: Any, cutoff: _date) -> bool:
-    """Return True if *end_date_raw* represents a date strictly before *cutoff*."""
-    if end_date_raw in (None, ""):
-        return False
-    try:
-        return parse_date(end_date_raw) < cutoff
-    except ValueError:
-        return False
+def collect_installed_from_librpm() -> Tuple[Dict[str, List[str]], List[str]]:
+    """Collect installed package/module data by reading the rpmdb via the rpm bindings.
+
+    Avoids the fork/exec, text formatting, and re-parsing of an `rpm -qa`
+    subprocess; the rpmdb is read directly. Raises ImportError when the rpm
+    Python bindings are not available, so callers can fall back to
+    collect_installed_from_rpm.
+    """
+
+    import rpm  # pylint: disable=import-outside-toplevel,import-error
+
+    modules_raw: dict[str, list[str]] = {}
+    installed_packages: set[str] = set()
+
+    for header in rpm.TransactionSet().dbMatch():
+        package_name = header[rpm.RPMTAG_NAME]
+        if isinstance(package_name, bytes):
+            package_name = package_name.decode("utf-8")
+
+        label = header[rpm.RPMTAG_MODULARITYLABEL]
+        if isinstance(label, bytes):
+            label = label.decode("utf-8")
+
+        if not label or label == "(none)":
+            installed_packages.add(package_name)
+            continue
+
+        label_parts = label.split(":")
+        if len(label_parts) < 2 or not label_parts[0] or not label_parts[1]:
+            raise ValueError(f"Invalid MODULARITYLABEL format for package '{package_name}': '{label}'")
+
+        modules_raw.setdefault(f"{label_parts[0]}:{label_parts[1]}", []).append(package_name)
+
+    return modules_raw, sorted(installed_packages)
+
+
+# Retired reference sets keyed by (id(major_data), target_major, cutoff).
+# Ansible runs loop over many hosts with the same grouped_data/date, so the
+# reference scan (dict lookups + date parses per entry) is pure repetition
+# after the first call. Plain dicts are not weak-referenceable, so entries
+# store a strong reference to the keyed dict alongside the sets: that pins
+# the dict alive (CPython cannot reuse its id for a new object) and lookups
+# validate identity, so a stale hit after garbage collection is impossible.
+# The cache is bounded by size and can be disabled via environment.
+_REFERENCE_CACHE: Dict[Tuple[int, str, _date], Tuple[Dict[str, Any], Tuple[frozenset, frozenset]]] = {}
+_REFERENCE_CACHE_MAX = 64
+
+
+def _reference_cache_enabled() -> bool:
+    """Return False when caching is disabled via APPSTREAM_DISABLE_CACHE."""
+    return os.environ.get("APPSTREAM_DISABLE_CACHE", "") not in ("1", "true", "yes")
+
+
+# Full evaluation results for evaluate_appstream_check_cached, keyed by the
+# caller-supplied grouped_data key plus all remaining evaluation inputs.
+_RESULT_CACHE: Dict[Tuple, Tuple[Dict[str, Any], List[str]]] = {}
+_RESULT_CACHE_MAX = 16
+
+# Reference rows flattened to (key, end_date) tuples with dates parsed once,
+# keyed by id(major_data). Unlike _REFERENCE_CACHE this is cutoff-independent,
+# so evaluations with different dates share the parsing work. Entries pin the
+# keyed dict with a strong reference and lookups validate identity, for the
+# same id-reuse safety as _REFERENCE_CACHE.
+_NORMALIZED_CACHE: Dict[
+    int,
+    Tuple[Dict[str, Any], Tuple[Tuple[Tuple[str, _date], ...], Tuple[Tuple[str, _date], ...]]],
+] = {}
+
+
+def clear_reference_cache() -> None:
+    """Clear the memoized retired reference sets and results (mainly for tests)."""
+    _REFERENCE_CACHE.clear()
+    _RESULT_CACHE.clear()
+    _NORMALIZED_CACHE.clear()
+
+
+def _normalize_major_data(
+    major_data: Dict[str, Any],
+) -> Tuple[Tuple[Tuple[str, _date], ...], Tuple[Tuple[str, _date], ...]]:
+    """Flatten reference entry dicts to compact (key, end_date) tuples.
+
+    Dates are parsed exactly once here; entries without a usable name/stream
+    or with a missing/unparseable end_date can never match and are dropped.
+    """
+
+    # Explicit loops so name/stream are looked up once per entry instead of
+    # once in the filter and again in the projection.
+    package_rows = []
+    for item in major_data.get("package", []) or []:
+        name = item.get("name")
+        end_date_raw = item.get("end_date")
+        # None and "" are both falsy, so plain truthiness filters both.
+        if not name or not end_date_raw:
+            continue
+        try:
+            package_rows.append((str(name), parse_date(end_date_raw)))
+        except ValueError:
+            continue
+
+    module_rows = []
+    for item in major_data.get("dnf_module", []) or []:
+        name = item.get("name")
+        stream = item.get("stream")
+        end_date_raw = item.get("end_date")
+        if not name or not stream or not end_date_raw:
+            continue
+        try:
+            module_rows.append((f"{name}:{stream}", parse_date(end_date_raw)))
+        except ValueError:
+            continue
+
+    return tuple(package_rows), tuple(module_rows)
+
+
+def _normalized_rows(
+    major_data: Dict[str, Any],
+) -> Tuple[Tuple[Tuple[str, _date], ...], Tuple[Tuple[str, _date], ...]]:
+    """Return the normalized reference rows for *major_data*, memoized by identity."""
+
+    if not _reference_cache_enabled():
+        return _normalize_major_data(major_data)
+
+    cache_key = id(major_data)
+    entry = _NORMALIZED_CACHE.get(cache_key)
+    if entry is not None and entry[0] is major_data:
+        return entry[1]
+    if len(_NORMALIZED_CACHE) >= _REFERENCE_CACHE_MAX:
+        _NORMALIZED_CACHE.clear()
+    rows = _normalize_major_data(major_data)
+    _NORMALIZED_CACHE[cache_key] = (major_data, rows)
+    return rows
+
+
+def _build_reference_sets(major_data: Dict[str, Any], cutoff: _date) -> Tuple[frozenset, frozenset]:
+    """Build frozensets of retired package names and retired module `name:stream` labels."""
+
+    package_rows, module_rows = _normalized_rows(major_data)
+
+    # Dates are already parsed, so the per-cutoff filter is one C-level
+    # date comparison per row.
+    reference_package_names = frozenset(name for name, end_date in package_rows if end_date < cutoff)
+    reference_module_names = frozenset(key for key, end_date in module_rows if end_date < cutoff)
+
+    return reference_package_names, reference_module_names
+
+
+# Above this many retired reference entries a two-pointer merge over sorted
+# lists beats per-element hashing for the installed/retired intersection.
+_MERGE_THRESHOLD = 512
+
+
+def _sorted_intersect(left: List[str], right: List[str]) -> List[str]:
+    """Intersect two sorted, deduplicated string lists with a two-pointer merge."""
+    result: list = []
+    i = j = 0
+    left_len, right_len = len(left), len(right)
+    while i < left_len and j < right_len:
+        left_value, right_value = left[i], right[j]
+        if left_value == right_value:
+            result.append(left_value)
+            i += 1
+            j += 1
+        elif left_value < right_value:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def _empty_result(target_major: str) -> Tuple[Dict[str, Any], List[str]]:
+    """Build the no-match result payload returned by the early-exit paths."""
+    return (
+        {
+            "target_major": target_major,
+            "matched_packages": [],
+            "matched_dnf_modules": [],
+            "matched_dnf_modules_packages": [],
+            "any_match": False,
+        },
+        [],
+    )
 
 
 def evaluate_appstream_check(
@@ -113,7 +371,7 @@ def evaluate_appstream_check(
     target_major: str,
     selected_date: Union[str, _date],
     installed_dnf_modules_raw: Dict[str, List[str]],
-    installed_packages: List[str],
+    installed_packages: Collection[str],
 ) -> Tuple[Dict[str, Any], List[str]]:
     """Evaluate installed data against lifecycle references and build result payloads."""
 
@@ -123,40 +381,55 @@ def evaluate_appstream_check(
     if major_data is None:
         raise KeyError(target_major)
 
-    packages_data = major_data.get("package", []) or []
-    modules_data = major_data.get("dnf_module", []) or []
-
-    reference_package_names = sorted(
-        set(
-            str(item.get("name"))
-            for item in packages_data
-            if _is_retired(item.get("end_date"), cutoff) and item.get("name")
-        )
-    )
-
-    reference_module_names = sorted(
-        set(
-            f"{item.get('name')}:{item.get('stream')}"
-            for item in modules_data
-            if _is_retired(item.get("end_date"), cutoff)
-            and item.get("name") not in (None, "")
-            and item.get("stream") not in (None, "")
-        )
-    )
-
-    retired_installed_packages = sorted(set(installed_packages).intersection(reference_package_names))
-    installed_dnf_modules = sorted(set(installed_dnf_modules_raw.keys()).intersection(reference_module_names))
-
-    matched_dnf_modules_packages = sorted(
-        set(
-            package_name
-            for module_name in installed_dnf_modules
-            for package_name in installed_dnf_modules_raw.get(module_name, [])
-        )
-    )
-
-    any_match = bool(retired_installed_packages or installed_dnf_modules)
-    packages_to_remove = sorted(set(retired_installed_packages + matched_dnf_modules_packages))
+    # Nothing installed means nothing can match; skip the reference scan too.
+    if not installed_packages and not installed_dnf_modules_raw:
+        return _empty_result(target_major)
+
+    if _reference_cache_enabled():
+        cache_key = (id(major_data), target_major, cutoff)
+        entry = _REFERENCE_CACHE.get(cache_key)
+        if entry is not None and entry[0] is major_data:
+            reference_sets = entry[1]
+        else:
+            if len(_REFERENCE_CACHE) >= _REFERENCE_CACHE_MAX:
+                _REFERENCE_CACHE.clear()
+            reference_sets = _build_reference_sets(major_data, cutoff)
+            _REFERENCE_CACHE[cache_key] = (major_data, reference_sets)
+    else:
+        reference_sets = _build_reference_sets(major_data, cutoff)
+    reference_package_names, reference_module_names = reference_sets
+
+    # Nothing retired for this major/date: the intersections below are
+    # provably empty, so skip building them.
+    if not reference_package_names and not reference_module_names:
+        return _empty_result(target_major)
+
+    # Iterate the (typically tiny) retired reference side and probe the large
+    # installed side as a hash set instead of the other way around. Keep sets
+    # internally and sort exactly once per returned field.
+    installed_package_set = frozenset(installed_packages)
+    if len(reference_package_names) > _MERGE_THRESHOLD:
+        # Long-dated reference histories: merge two sorted lists linearly
+        # instead of hashing every reference name.
+        retired_package_set = set(_sorted_intersect(sorted(installed_package_set), sorted(reference_package_names)))
+    else:
+        retired_package_set = {name for name in reference_package_names if name in installed_package_set}
+    matched_module_set = {name for name in reference_module_names if name in installed_dnf_modules_raw}
+
+    # Flatten the per-module package lists with C-level set.update calls
+    # instead of a nested generator.
+    matched_module_package_set: set = set()
+    for module_name in matched_module_set:
+        module_packages = installed_dnf_modules_raw.get(module_name)
+        if module_packages:
+            matched_module_package_set.update(module_packages)
+
+    retired_installed_packages = sorted(retired_package_set)
+    installed_dnf_modules = sorted(matched_module_set)
+    matched_dnf_modules_packages = sorted(matched_module_package_set)
+
+    any_match = bool(retired_package_set or matched_module_set)
+    packages_to_remove = sorted(retired_package_set | matched_module_package_set)
 
     appstream_check_result = {
         "target_major": target_major,
@@ -167,3 +440,50 @@ def evaluate_appstream_check(
     }
 
     return appstream_check_result, packages_to_remove
+
+
+def evaluate_appstream_check_cached(  # pylint: disable=too-many-arguments
+    grouped_data: Dict[str, Any],
+    target_major: str,
+    selected_date: Union[str, _date],
+    installed_dnf_modules_raw: Dict[str, List[str]],
+    installed_packages: Collection[str],
+    *,
+    grouped_data_key: Any = None,
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Evaluate as evaluate_appstream_check, memoizing full results per input combination.
+
+    Intended for long-lived callers that re-evaluate identical inputs (the
+    Ansible module itself runs in a fresh process per invocation, so it does
+    not benefit). *grouped_data_key* must uniquely identify the grouped_data
+    content, for example a content hash; with None, or when caching is
+    disabled, this delegates straight to evaluate_appstream_check. Returned
+    payloads are fresh copies, safe for callers to mutate.
+    """
+
+    if grouped_data_key is None or not _reference_cache_enabled():
+        return evaluate_appstream_check(
+            grouped_data, target_major, selected_date, installed_dnf_modules_raw, installed_packages
+        )
+
+    cache_key = (
+        grouped_data_key,
+        target_major,
+        parse_date(selected_date),
+        tuple(sorted(installed_packages)),
+        tuple((key, tuple(value)) for key, value in sorted(installed_dnf_modules_raw.items())),
+    )
+
+    cached = _RESULT_CACHE.get(cache_key)
+    if cached is None:
+        if len(_RESULT_CACHE) >= _RESULT_CACHE_MAX:
+            _RESULT_CACHE.clear()
+        cached = _RESULT_CACHE[cache_key] = evaluate_appstream_check(
+            grouped_data, target_major, selected_date, installed_dnf_modules_raw, installed_packages
+        )
+
+    result, packages_to_remove = cached
+    result_copy = dict(result)
+    for field in ("matched_packages", "matched_dnf_modules", "matched_dnf_modules_packages"):
+        result_copy[field] = list(result_copy[field])
+    return result_copy, list(packages_to_remove)
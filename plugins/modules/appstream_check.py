@@ -120,9 +120,12 @@ def _detect_target_major(module: AnsibleModule) -> str:
         raise
 
 
-def _run_rpm_modularity(module: AnsibleModule) -> Tuple[Dict[str, List[str]], List[str]]:
+def _run_rpm_modularity(module: AnsibleModule, include_modules: bool = True) -> Tuple[Dict[str, List[str]], List[str]]:
     try:
-        return collect_installed_from_rpm(lambda command: module.run_command(command, check_rc=True))
+        return collect_installed_from_rpm(
+            lambda command: module.run_command(command, check_rc=True),
+            include_modules=include_modules,
+        )
     except ValueError as exc:
         module.fail_json(msg=str(exc))
         raise
@@ -147,17 +150,24 @@ def main():
     selected_date = module.params["date"] or datetime_date.today().isoformat()
 
     try:
-        parse_date(selected_date)
+        cutoff_date = parse_date(selected_date)
     except ValueError as exc:
         module.fail_json(msg=str(exc))
+        raise
+
+    # Fail before the rpm query: a missing target_major is a guaranteed
+    # failure and the rpm invocation is the expensive step.
+    if target_major not in grouped_data:
+        module.fail_json(msg=f"target_major '{target_major}' not found in grouped_data.")
 
-    installed_dnf_modules_raw, installed_packages = _run_rpm_modularity(module)
+    # EL7 has no modular packages, so skip querying/parsing the modularity column.
+    installed_dnf_modules_raw, installed_packages = _run_rpm_modularity(module, include_modules=target_major != "el7")
     try:
         # pylint: disable=duplicate-code
         appstream_check_result, packages_to_remove = evaluate_appstream_check(
             grouped_data=grouped_data,
             target_major=target_major,
-            selected_date=selected_date,
+            selected_date=cutoff_date,
             installed_dnf_modules_raw=installed_dnf_modules_raw,
             installed_packages=installed_packages,
         )
@@ -5,6 +5,8 @@
 
 import argparse
 import json
+import os
+import pickle
 import subprocess
 import sys
 from datetime import date as datetime_date
@@ -18,12 +20,61 @@ if str(MODULE_UTILS_PATH) not in sys.path:
     sys.path.insert(0, str(MODULE_UTILS_PATH))
 
 import yaml  # noqa: E402
-from appstream_check_core import collect_installed_from_rpm, detect_target_major, evaluate_appstream_check, parse_date  # noqa: E402
+from appstream_check_core import (  # noqa: E402
+    collect_installed_from_librpm,
+    collect_installed_from_rpm,
+    detect_target_major,
+    evaluate_appstream_check,
+    parse_date,
+)
+
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml, much faster
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+def _load_yaml_cached(path: Path):
+    """Load a YAML file, keeping a pickle sidecar keyed by mtime/size.
+
+    The grouped appstream data file is hundreds of KB and changes rarely;
+    a warm start then costs a single pickle.load instead of a YAML parse.
+    Cache read/write failures fall back to a plain YAML load.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        stat = None
+
+    header = (stat.st_mtime_ns, stat.st_size) if stat is not None else None
+    cache_path = path.with_suffix(".cache.pkl")
+
+    if header is not None:
+        try:
+            with cache_path.open("rb") as handle:
+                cached_header, cached_data = pickle.load(handle)
+            if cached_header == header:
+                return cached_data
+        except (OSError, pickle.UnpicklingError, ValueError, EOFError):
+            pass
+
+    with path.open("r", encoding="utf-8") as handle:
+        data = yaml.load(handle, Loader=_YamlLoader) or {}
+
+    if header is not None:
+        try:
+            tmp_path = cache_path.with_suffix(".tmp")
+            with tmp_path.open("wb") as handle:
+                pickle.dump((header, data), handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+    return data
 
 
 def _load_grouped_data(path: Path):
-    with path.open("r", encoding="utf-8") as file_handle:
-        content = yaml.safe_load(file_handle) or {}
+    content = _load_yaml_cached(path)
 
     if "appstream_check_grouped" in content and isinstance(content["appstream_check_grouped"], dict):
         return content["appstream_check_grouped"]
@@ -85,15 +136,24 @@ def _collect_payload(args):
     grouped_data = _load_grouped_data(grouped_data_file)
 
     target_major = args.target_major or detect_target_major()
+    if target_major not in grouped_data:
+        # Fail before the rpm query; evaluation would raise the same KeyError.
+        raise KeyError(target_major)
     selected_date = args.date or datetime_date.today().isoformat()
-    parse_date(selected_date)  # validate early
-    installed_dnf_modules_raw, installed_packages = collect_installed_from_rpm(_run_command)
+    cutoff_date = parse_date(selected_date)  # validate early, parse once
+    try:
+        # Read the rpmdb directly when the rpm bindings are available.
+        installed_dnf_modules_raw, installed_packages = collect_installed_from_librpm()
+    except ImportError:
+        installed_dnf_modules_raw, installed_packages = collect_installed_from_rpm(
+            _run_command, include_modules=target_major != "el7"
+        )
 
     # pylint: disable=duplicate-code
     appstream_check_result, packages_to_remove = evaluate_appstream_check(
         grouped_data=grouped_data,
         target_major=target_major,
-        selected_date=selected_date,
+        selected_date=cutoff_date,
         installed_dnf_modules_raw=installed_dnf_modules_raw,
         installed_packages=installed_packages,
     )
@@ -2,18 +2,24 @@
 
 """Fetch and transform Red Hat AppStream lifecycle data into collection vars format."""
 
-import asyncio
 import argparse
 import json
 import logging
 import os
 import sys
+import urllib.error
+import urllib.parse
+import urllib.request
 from pathlib import Path
 from typing import Any
 
-import aiohttp
 import yaml
 
+try:
+    from yaml import CSafeDumper as _YamlDumper  # libyaml, much faster
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
 
 OFFLINE_ACCESS_TOKEN = os.getenv("OFFLINE_ACCESS_TOKEN", "")
 SSO_TOKEN_URL = "https://sso.redhat.com/auth/realms/redhat-external/protocol/openid-connect/token"
@@ -23,6 +29,7 @@ LOGGER = logging.getLogger(__name__)
 REPO_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_OUTPUT_FILE = REPO_ROOT / "roles" / "appstream_check" / "vars" / "redhat_appstreams.yml"
 DEFAULT_OUTPUT_VAR = "appstream_check_grouped"
+_VALID_IMPLS = frozenset(("package", "dnf_module"))
 
 
 def parse_args() -> argparse.Namespace:
@@ -41,7 +48,7 @@ def parse_args() -> argparse.Namespace:
         "--trust-env",
         action="store_true",
         default=False,
-        help="Use environment variables for proxy and auth settings in aiohttp.",
+        help="Use environment variables for proxy settings.",
     )
     parser.add_argument(
         "--output-file",
@@ -79,32 +86,50 @@ def configure_logging(log_level: str) -> None:
     )
 
 
-async def login(offline_access_token: str, trust_env: bool) -> str:
+def build_opener(trust_env: bool) -> urllib.request.OpenerDirector:
+    """Build a urllib opener, honoring proxy environment variables only when requested."""
+
+    if trust_env:
+        return urllib.request.build_opener()
+    return urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+
+def _read_response(opener: urllib.request.OpenerDirector, request: urllib.request.Request, timeout: int, label: str) -> str:
+    """Perform a request and return the response body, raising RuntimeError on HTTP errors."""
+
+    try:
+        with opener.open(request, timeout=timeout) as response:
+            return response.read().decode("utf-8", errors="replace")
+    except urllib.error.HTTPError as exc:
+        body = exc.read().decode("utf-8", errors="replace")
+        raise RuntimeError(f"{label} failed (HTTP {exc.code}): {body}") from exc
+
+
+def login(offline_access_token: str, opener: urllib.request.OpenerDirector) -> str:
     """Exchange an offline token for an access token via Red Hat SSO."""
 
     if not offline_access_token:
         raise ValueError("OFFLINE_ACCESS_TOKEN is empty")
 
-    payload = {
-        "grant_type": "refresh_token",
-        "client_id": SSO_CLIENT_ID,
-        "refresh_token": offline_access_token,
-    }
+    payload = urllib.parse.urlencode(
+        {
+            "grant_type": "refresh_token",
+            "client_id": SSO_CLIENT_ID,
+            "refresh_token": offline_access_token,
+        }
+    ).encode("utf-8")
 
-    async with aiohttp.ClientSession(trust_env=trust_env) as session:
-        async with session.post(SSO_TOKEN_URL, data=payload) as response:
-            body = await response.text()
-            if response.status != 200:
-                raise RuntimeError(f"Login failed (HTTP {response.status}): {body}")
+    request = urllib.request.Request(SSO_TOKEN_URL, data=payload)
+    body = _read_response(opener, request, timeout=30, label="Login")
 
-            data = await response.json()
-            access_token = data.get("access_token", "")
-            if not access_token:
-                raise RuntimeError("Login response missing access_token")
-            return access_token
+    data = json.loads(body)
+    access_token = data.get("access_token", "")
+    if not access_token:
+        raise RuntimeError("Login response missing access_token")
+    return access_token
 
 
-async def get_appstreams(access_token: str, trust_env: bool) -> dict[str, Any]:
+def get_appstreams(access_token: str, opener: urllib.request.OpenerDirector) -> dict[str, Any]:
     """Fetch raw AppStream lifecycle payload from the Red Hat API."""
 
     headers = {
@@ -112,14 +137,9 @@ async def get_appstreams(access_token: str, trust_env: bool) -> dict[str, Any]:
         "Content-Type": "application/json",
     }
 
-    async with aiohttp.ClientSession(trust_env=trust_env) as session:
-        async with session.get(APPSTREAMS_URL, headers=headers) as response:
-            body = await response.text()
-            if response.status != 200:
-                raise RuntimeError(
-                    f"AppStreams request failed (HTTP {response.status}): {body}"
-                )
-            return await response.json()
+    request = urllib.request.Request(APPSTREAMS_URL, headers=headers)
+    body = _read_response(opener, request, timeout=60, label="AppStreams request")
+    return json.loads(body)
 
 
 def transform_appstreams(appstreams: dict[str, Any]) -> dict[str, dict[str, list[dict[str, Any]]]]:
@@ -128,13 +148,20 @@ def transform_appstreams(appstreams: dict[str, Any]) -> dict[str, dict[str, list
     grouped: dict[str, dict[str, list[dict[str, Any]]]] = {}
     items = appstreams.get("data", []) if isinstance(appstreams, dict) else []
 
+    # Hot loop over thousands of API entries: bind setdefault once and cache
+    # the el-key strings and target lists so the handful of (major, impl)
+    # combinations pay for dict creation only once.
+    grouped_setdefault = grouped.setdefault
+    el_keys: dict[int, str] = {}
+    target_lists: dict[tuple[str, str], list[dict[str, Any]]] = {}
+
     for item in items:
         if not isinstance(item, dict):
             continue
 
         os_major = int(item.get("os_major", 0))
         impl = str(item.get("impl", "unknown"))
-        if impl not in {"package", "dnf_module"}:
+        if impl not in _VALID_IMPLS:
             continue
 
         compact_item: dict[str, Any] = {
@@ -145,7 +172,14 @@ def transform_appstreams(appstreams: dict[str, Any]) -> dict[str, dict[str, list
             "os_major": os_major,
         }
 
-        grouped.setdefault(f"el{os_major}", {}).setdefault(impl, []).append(compact_item)
+        el_key = el_keys.get(os_major)
+        if el_key is None:
+            el_key = el_keys[os_major] = f"el{os_major}"
+
+        target_list = target_lists.get((el_key, impl))
+        if target_list is None:
+            target_list = target_lists[(el_key, impl)] = grouped_setdefault(el_key, {}).setdefault(impl, [])
+        target_list.append(compact_item)
 
     return grouped
 
@@ -158,15 +192,17 @@ def write_output_file(path: str, payload: dict[str, Any], output_format: str, ou
 
     with output_path.open("w", encoding="utf-8") as handle:
         if output_format == "json":
-            json.dump(payload, handle, indent=2)
+            # Serialize to one string first: a single bulk write instead of
+            # the many small writes json.dump issues.
+            handle.write(json.dumps(payload, indent=2))
             return
         if output_format == "yaml":
-            yaml.safe_dump({output_var: payload}, handle, sort_keys=False)
+            yaml.dump({output_var: payload}, handle, Dumper=_YamlDumper, sort_keys=False)
             return
         raise ValueError(f"Unsupported output format: {output_format}")
 
 
-async def run(
+def run(
     trust_env: bool,
     output_file: str,
     output_format: str,
@@ -175,9 +211,10 @@ async def run(
 ) -> None:
     """Execute login, fetch, optional print, transform, and output write workflow."""
 
-    access_token = await login(OFFLINE_ACCESS_TOKEN, trust_env)
+    opener = build_opener(trust_env)
+    access_token = login(OFFLINE_ACCESS_TOKEN, opener)
     LOGGER.debug("access_token acquired (prefix): %s...", access_token[:12])
-    appstreams = await get_appstreams(access_token, trust_env)
+    appstreams = get_appstreams(access_token, opener)
     if print_appstreams_json:
         print(json.dumps(appstreams, indent=2))
         return
@@ -198,14 +235,12 @@ def main() -> None:
     configure_logging(args.log_level)
 
     try:
-        asyncio.run(
-            run(
-                args.trust_env,
-                args.output_file,
-                args.output_format,
-                args.output_var,
-                args.print_appstreams_json,
-            )
+        run(
+            args.trust_env,
+            args.output_file,
+            args.output_format,
+            args.output_var,
+            args.print_appstreams_json,
         )
     except Exception as exc:
         LOGGER.error("Execution failed: %s", exc)
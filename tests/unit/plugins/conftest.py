@@ -0,0 +1,21 @@
+"""Shared fixtures for plugin unit tests."""
+
+import pytest
+
+from ansible_collections.klaas_.appstream.plugins.module_utils import appstream_check_core as core
+
+
+@pytest.fixture(autouse=True)
+def _clear_core_caches():
+    """Clear the core module's memos between tests.
+
+    Cache entries pin their grouped data dicts alive and the os-release
+    cache is keyed by path; clearing keeps tests isolated and stops test
+    data accumulating across the run. Lives at the plugins level because
+    the module tests drive the same caches through appstream_check.main.
+    """
+    core.clear_reference_cache()
+    core.clear_os_release_cache()
+    yield
+    core.clear_reference_cache()
+    core.clear_os_release_cache()
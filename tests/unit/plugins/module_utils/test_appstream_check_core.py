@@ -142,6 +142,83 @@ def test_parse_rpm_modularity_output_bad_modularitylabel():
         core.parse_rpm_modularity_output("pkg-a badlabel\n")
 
 
+# ---------------------------------------------------------------------------
+# collect_installed_from_rpm
+# ---------------------------------------------------------------------------
+
+def test_collect_installed_from_rpm_without_modules():
+    """include_modules=False queries names only and skips modularity parsing."""
+    commands = []
+
+    def fake_run_command(command):
+        commands.append(command)
+        return 0, "pkg-b\npkg-a\npkg-b\n", ""
+
+    modules_raw, installed_packages = core.collect_installed_from_rpm(fake_run_command, include_modules=False)
+
+    assert not modules_raw
+    assert installed_packages == ["pkg-a", "pkg-b"]
+    assert len(commands) == 1
+    assert "%{NAME}\\n" in commands[0]
+
+
+def test_collect_installed_from_rpm_with_modules():
+    """Default query includes the MODULARITYLABEL column."""
+    def fake_run_command(_command):
+        return 0, "pkg-a (none)\npkg-b nodejs:18:ctx\n", ""
+
+    modules_raw, installed_packages = core.collect_installed_from_rpm(fake_run_command)
+
+    assert modules_raw == {"nodejs:18": ["pkg-b"]}
+    assert installed_packages == ["pkg-a"]
+
+
+# ---------------------------------------------------------------------------
+# _sorted_intersect
+# ---------------------------------------------------------------------------
+
+def test_sorted_intersect_common_elements():
+    """Two-pointer merge returns common elements in sorted order."""
+    assert core._sorted_intersect(["a", "c", "e", "g"], ["b", "c", "d", "e"]) == ["c", "e"]  # pylint: disable=protected-access
+
+
+def test_sorted_intersect_identical_inputs():
+    """Identical lists intersect to themselves."""
+    assert core._sorted_intersect(["a", "b"], ["a", "b"]) == ["a", "b"]  # pylint: disable=protected-access
+
+
+def test_sorted_intersect_empty_and_disjoint():
+    """Empty or disjoint inputs produce an empty intersection."""
+    assert not core._sorted_intersect([], ["a"])  # pylint: disable=protected-access
+    assert not core._sorted_intersect(["a"], [])  # pylint: disable=protected-access
+    assert not core._sorted_intersect(["a", "b"], ["c", "d"])  # pylint: disable=protected-access
+
+
+def test_evaluate_appstream_check_above_merge_threshold():
+    """Reference sets above _MERGE_THRESHOLD take the sorted-merge path with identical results."""
+    count = core._MERGE_THRESHOLD + 10  # pylint: disable=protected-access
+    grouped_data = {
+        "el9": {
+            "package": [{"name": f"pkg-{i:04d}", "end_date": "2020-01-01"} for i in range(count)],
+            "dnf_module": [],
+        }
+    }
+    installed_packages = [f"pkg-{i:04d}" for i in range(0, count, 7)] + ["unrelated-pkg"]
+
+    result, packages_to_remove = core.evaluate_appstream_check(
+        grouped_data=grouped_data,
+        target_major="el9",
+        selected_date="2026-02-17",
+        installed_dnf_modules_raw={},
+        installed_packages=installed_packages,
+    )
+
+    expected = sorted(f"pkg-{i:04d}" for i in range(0, count, 7))
+    assert result["matched_packages"] == expected
+    assert result["any_match"] is True
+    assert packages_to_remove == expected
+
+
 # ---------------------------------------------------------------------------
 # evaluate_appstream_check
 # ---------------------------------------------------------------------------
@@ -333,6 +410,133 @@ def test_evaluate_appstream_check_invalid_date_raises():
         )
 
 
+def test_evaluate_appstream_check_reference_cache_reused():
+    """Repeated calls with the same grouped_data/target_major/date reuse cached reference sets."""
+    grouped_data = {
+        "el9": {
+            "package": [{"name": "retired-nonmod", "end_date": "2020-01-01"}],
+            "dnf_module": [],
+        }
+    }
+
+    core.evaluate_appstream_check(
+        grouped_data=grouped_data,
+        target_major="el9",
+        selected_date="2026-02-17",
+        installed_dnf_modules_raw={},
+        installed_packages=["retired-nonmod"],
+    )
+
+    assert len(core._REFERENCE_CACHE) == 1  # pylint: disable=protected-access
+
+    # Mutations of already-seen grouped_data are intentionally not detected.
+    grouped_data["el9"]["package"].append({"name": "other-retired", "end_date": "2020-01-01"})
+
+    result, _packages_to_remove = core.evaluate_appstream_check(
+        grouped_data=grouped_data,
+        target_major="el9",
+        selected_date="2026-02-17",
+        installed_dnf_modules_raw={},
+        installed_packages=["retired-nonmod", "other-retired"],
+    )
+
+    assert result["matched_packages"] == ["retired-nonmod"]
+
+    core.clear_reference_cache()
+    assert not core._REFERENCE_CACHE  # pylint: disable=protected-access
+
+
+def test_evaluate_appstream_check_cache_not_stale_after_replacement():
+    """A new grouped_data dict never hits the previous dict's cached reference sets."""
+    def make_grouped(name):
+        return {"el9": {"package": [{"name": name, "end_date": "2020-01-01"}], "dnf_module": []}}
+
+    kwargs = {
+        "target_major": "el9",
+        "selected_date": "2026-02-17",
+        "installed_dnf_modules_raw": {},
+        "installed_packages": ["retired-a", "retired-b"],
+    }
+
+    first = make_grouped("retired-a")
+    result, _packages_to_remove = core.evaluate_appstream_check(grouped_data=first, **kwargs)
+    assert result["matched_packages"] == ["retired-a"]
+
+    # Drop the first dict; CPython may hand its freed address to the very
+    # next allocation, which must not turn into a cache hit for new data.
+    del first
+    result, _packages_to_remove = core.evaluate_appstream_check(grouped_data=make_grouped("retired-b"), **kwargs)
+    assert result["matched_packages"] == ["retired-b"]
+
+
+def test_evaluate_appstream_check_cache_disabled_via_env(monkeypatch):
+    """APPSTREAM_DISABLE_CACHE=1 bypasses the reference memo entirely."""
+    monkeypatch.setenv("APPSTREAM_DISABLE_CACHE", "1")
+
+    grouped_data = {
+        "el9": {
+            "package": [{"name": "retired-nonmod", "end_date": "2020-01-01"}],
+            "dnf_module": [],
+        }
+    }
+
+    result, _packages_to_remove = core.evaluate_appstream_check(
+        grouped_data=grouped_data,
+        target_major="el9",
+        selected_date="2026-02-17",
+        installed_dnf_modules_raw={},
+        installed_packages=["retired-nonmod"],
+    )
+
+    assert result["matched_packages"] == ["retired-nonmod"]
+    assert not core._REFERENCE_CACHE  # pylint: disable=protected-access
+
+
+def test_evaluate_appstream_check_cached_returns_fresh_copies():
+    """Cached wrapper memoizes per input combination and hands out mutable copies."""
+    grouped_data = {
+        "el9": {
+            "package": [{"name": "retired-nonmod", "end_date": "2020-01-01"}],
+            "dnf_module": [],
+        }
+    }
+
+    kwargs = {
+        "grouped_data": grouped_data,
+        "target_major": "el9",
+        "selected_date": "2026-02-17",
+        "installed_dnf_modules_raw": {},
+        "installed_packages": ["retired-nonmod"],
+        "grouped_data_key": "content-hash-1",
+    }
+
+    first_result, first_packages = core.evaluate_appstream_check_cached(**kwargs)
+    first_packages.append("mutated")
+    first_result["matched_packages"].append("mutated")
+
+    second_result, second_packages = core.evaluate_appstream_check_cached(**kwargs)
+
+    assert second_result["matched_packages"] == ["retired-nonmod"]
+    assert second_packages == ["retired-nonmod"]
+    assert len(core._RESULT_CACHE) == 1  # pylint: disable=protected-access
+
+
+def test_evaluate_appstream_check_cached_without_key_skips_cache():
+    """grouped_data_key=None delegates without populating the result cache."""
+    grouped_data = {"el9": {"package": [], "dnf_module": []}}
+
+    result, _packages_to_remove = core.evaluate_appstream_check_cached(
+        grouped_data=grouped_data,
+        target_major="el9",
+        selected_date="2026-02-17",
+        installed_dnf_modules_raw={},
+        installed_packages=[],
+    )
+
+    assert result["any_match"] is False
+    assert not core._RESULT_CACHE  # pylint: disable=protected-access
+
+
 def test_evaluate_appstream_check_malformed_end_date_ignored():
     """Entries with unparseable end_date are silently skipped, not treated as retired."""
     grouped_data = {